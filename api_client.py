@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from result_store import payload_key
+
+API_URL = "https://youtube-trend-api.onrender.com/analyze-shorts"
+CONTENT_TYPES = ["shorts", "videos", "both"]
+REGION_CODES = ["US", "IN", "GB", "CA", "AU", "DE", "FR", "JP", "KR", "BR", "RU"]
+
+
+class AnalysisError(Exception):
+    pass
+
+
+class AnalysisClient:
+    # Client for the /analyze-shorts backend.
+    # Responses may come back compressed with any codec urllib3 can decode here
+    # (gzip and deflate, plus br/zstd when brotli/zstandard are installed).
+    # The last results are kept with their validator, so repeating an identical
+    # request sends If-None-Match. The server can then answer 304 with an empty body.
+    # When the backend sends no ETag, the client falls back to content-hash revalidation.
+    # The validator is then the SHA-256 hex digest of the decoded response body, in double
+    # quotes. This only helps if the backend computes exactly that hash over the body it
+    # would send, and answers 304 when it matches If-None-Match. Otherwise every request
+    # downloads the full payload, as before.
+    # stand_in_server.py runs these behaviours against a local server.
+    # With a result_store, the cache keeps only each validator and the payload's store key,
+    # so a payload the store evicts is really freed. The next identical request is then
+    # sent without If-None-Match.
+
+    def __init__(self, url=API_URL, timeout=300, cache_size=64, compress_requests=False, result_store=None):
+        self.url = url
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.compress_requests = compress_requests
+        self.result_store = result_store
+        self.session = requests.Session()
+        self._cache = OrderedDict()  # request hash -> (validator, marketing_strategy or store key)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "revalidated": 0, "bytes_received": 0}
+
+    def analyze(self, prompt, content_type, region_code):
+        body = json.dumps({
+            "prompt": prompt,
+            "content_type": content_type,
+            "region_code": region_code
+        }, sort_keys=True).encode("utf-8")
+        request_key = hashlib.sha256(body).hexdigest()
+
+        headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING
+        }
+        cached = self._cached(request_key)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        if self.compress_requests:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_received"] += int(response.headers.get("Content-Length") or len(response.content))
+
+            if response.status_code == 304 and cached is not None:
+                self.stats["revalidated"] += 1
+                # Another request may have evicted the entry while this one was in flight
+                if request_key in self._cache:
+                    self._cache.move_to_end(request_key)
+                return cached[1]
+
+        if response.status_code != 200:
+            try:
+                message = response.json().get('message', 'Unknown error')
+            except ValueError:
+                message = f"HTTP {response.status_code}"
+            raise AnalysisError(message)
+
+        try:
+            data = response.json()['data']['marketing_strategy']
+        except (ValueError, KeyError, TypeError):
+            raise AnalysisError("Malformed response")
+        validator = response.headers.get("ETag") or f'"{hashlib.sha256(response.content).hexdigest()}"'
+        cached_value = data if self.result_store is None else payload_key(data)
+        with self._lock:
+            self._cache[request_key] = (validator, cached_value)
+            self._cache.move_to_end(request_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def _cached(self, request_key):
+        # (validator, payload) for a previous identical request, or None
+        with self._lock:
+            cached = self._cache.get(request_key)
+            if cached is None or self.result_store is None:
+                return cached
+        payload = self.result_store.peek(cached[1])
+        if payload is None:
+            # The store evicted the payload, so there is nothing left to revalidate
+            with self._lock:
+                if self._cache.get(request_key) is cached:
+                    del self._cache[request_key]
+            return None
+        return cached[0], payload
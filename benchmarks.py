@@ -0,0 +1,252 @@
+import json
+import math
+import os
+import random
+import threading
+from collections import OrderedDict
+
+from metrics import compute_engagement_rates, compute_views_per_day, iter_payload_videos
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to best-effort writes without a file lock
+    fcntl = None
+
+BENCHMARK_METRICS = ['like_view', 'comment_view', 'engagement', 'views_per_day']
+ALL = "ALL"
+
+
+class KLLSketch:
+    # Mergeable streaming quantile sketch (Karnin, Lang & Liberty, 2016).
+    # Memory is bounded by roughly 3k items no matter how many values are added,
+    # and two sketches built in different processes can be merged losslessly
+    # with respect to their error guarantee.
+
+    def __init__(self, k=200):
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _size(self):
+        return sum(len(c) for c in self.compactors)
+
+    def _max_size(self):
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(float(value))
+        self.n += 1
+        self._compress()
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) >= self._capacity(level):
+                    if level + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    items = sorted(self.compactors[level])
+                    # Keep the odd one out at this level so weights stay exact
+                    kept = [items.pop()] if len(items) % 2 else []
+                    offset = random.randint(0, 1)
+                    self.compactors[level + 1].extend(items[offset::2])
+                    self.compactors[level] = kept
+                    break
+
+    def _weighted_items(self):
+        weighted = []
+        for level, items in enumerate(self.compactors):
+            weight = 2 ** level
+            weighted.extend((item, weight) for item in items)
+        weighted.sort()
+        return weighted
+
+    def quantiles(self, qs):
+        weighted = self._weighted_items()
+        if not weighted:
+            return [None for _ in qs]
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            target = q * total
+            cumulative = 0
+            value = weighted[-1][0]
+            for item, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    value = item
+                    break
+            results.append(value)
+        return results
+
+    def rank(self, value):
+        # Estimated fraction of observed values that are <= value
+        weighted = self._weighted_items()
+        if not weighted:
+            return None
+        total = sum(weight for _, weight in weighted)
+        return sum(weight for item, weight in weighted if item <= value) / total
+
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "compactors": self.compactors}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(k=state["k"])
+        sketch.n = state["n"]
+        sketch.compactors = [list(items) for items in state["compactors"]] or [[]]
+        return sketch
+
+
+def bucket_key(region_code, content_type):
+    return f"{region_code}|{content_type}"
+
+
+class BenchmarkStore:
+    # Engagement benchmarks learned from every video the app has seen, bucketed by
+    # region and content type (plus an ALL|ALL bucket).
+    # Each process keeps the merged on-disk state for reads and a delta of new
+    # observations. flush() merges the delta into the file under a lock, so several
+    # server processes can share one benchmark file.
+
+    def __init__(self, path, k=200, min_samples=30, seen_limit=50000):
+        self.path = path
+        self.k = k
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._merged = {}
+        self._delta = {}
+        # Trending videos show up in many analyses. This dedupe is best-effort: it only
+        # covers this process's lifetime and its most recent `seen_limit` videos, so a
+        # video can still be counted again after a restart or by another server process.
+        self._seen = OrderedDict()
+        self._seen_limit = seen_limit
+        self._merged = self._read_file()
+
+    def observe(self, data, region_code, content_type):
+        with self._lock:
+            for video in iter_payload_videos(data):
+                stats = video.get('statistics')
+                if not stats or not stats.get('views'):
+                    continue
+                values = compute_engagement_rates(stats)
+                values['views_per_day'] = compute_views_per_day(stats)
+                for key in {bucket_key(region_code, content_type), bucket_key(ALL, ALL)}:
+                    if self._mark_seen(key, video.get('video_id')):
+                        continue
+                    for metric in BENCHMARK_METRICS:
+                        for sketches in (self._merged, self._delta):
+                            self._sketch(sketches, key, metric).update(values[metric])
+        self.flush()
+
+    def percentiles(self, metric, region_code, content_type, qs=(0.25, 0.5, 0.75, 0.9)):
+        # Percentiles for the most specific bucket that has enough samples, else None
+        sketch = self._bucket_sketch(metric, region_code, content_type)
+        if sketch is None:
+            return None
+        with self._lock:
+            return dict(zip(qs, sketch.quantiles(qs)))
+
+    def percentile_rank(self, metric, value, region_code, content_type):
+        sketch = self._bucket_sketch(metric, region_code, content_type)
+        if sketch is None:
+            return None
+        with self._lock:
+            return sketch.rank(value)
+
+    def flush(self):
+        with self._lock:
+            if not self._delta:
+                return
+            delta, self._delta = self._delta, {}
+            with self._file_lock():
+                merged = self._read_file()
+                for key, metrics in delta.items():
+                    for metric, sketch in metrics.items():
+                        target = merged.setdefault(key, {})
+                        if metric in target:
+                            target[metric].merge(sketch)
+                        else:
+                            target[metric] = sketch
+                self._write_file(merged)
+            # Pick up observations flushed by other processes as well
+            self._merged = merged
+
+    def _bucket_sketch(self, metric, region_code, content_type):
+        with self._lock:
+            for key in (bucket_key(region_code, content_type), bucket_key(ALL, ALL)):
+                sketch = self._merged.get(key, {}).get(metric)
+                if sketch is not None and sketch.n >= self.min_samples:
+                    return sketch
+        return None
+
+    def _sketch(self, sketches, key, metric):
+        bucket = sketches.setdefault(key, {})
+        if metric not in bucket:
+            bucket[metric] = KLLSketch(k=self.k)
+        return bucket[metric]
+
+    def _mark_seen(self, key, video_id):
+        if video_id is None:
+            return False
+        seen_key = (key, video_id)
+        if seen_key in self._seen:
+            self._seen.move_to_end(seen_key)
+            return True
+        self._seen[seen_key] = True
+        if len(self._seen) > self._seen_limit:
+            self._seen.popitem(last=False)
+        return False
+
+    def _file_lock(self):
+        return _FileLock(self.path + ".lock")
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {
+            key: {metric: KLLSketch.from_dict(sketch) for metric, sketch in metrics.items()}
+            for key, metrics in state.items()
+        }
+
+    def _write_file(self, sketches):
+        state = {
+            key: {metric: sketch.to_dict() for metric, sketch in metrics.items()}
+            for key, metrics in sketches.items()
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
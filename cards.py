@@ -0,0 +1,220 @@
+# HTML templating for video cards, shared by the Streamlit UI and the report exporter.
+# Nothing in here may import streamlit.
+import html
+import json
+
+APP_CSS = """
+    /* Main styles */
+    .main {
+        background-color: #f9f9f9;
+    }
+    
+    /* Header styles */
+    .header-container {
+        background-color: #FF0000;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        color: white;
+        text-align: center;
+    }
+    
+    /* Card styles */
+    .video-card {
+        background-color: white;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        margin-bottom: 1rem;
+        padding: 1rem;
+        transition: transform 0.3s;
+    }
+    .video-card:hover {
+        transform: translateY(-5px);
+    }
+    
+    /* Metric styles */
+    .metric-container {
+        background-color: #f0f0f0;
+        border-radius: 8px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+    }
+    
+    /* Button styles */
+    .stButton>button {
+        background-color: #FF0000;
+        color: white;
+        border-radius: 20px;
+        padding: 0.5rem 1.5rem;
+        border: none;
+        font-weight: bold;
+    }
+    
+    /* Tab styles */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 0px;
+    }
+    .stTabs [data-baseweb="tab"] {
+        height: 50px;
+        white-space: pre-wrap;
+        # background-color: #f0f0f0;
+        border-radius: 4px 4px 0px 0px;
+        gap: 1px;
+        padding: 15px;
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: #FF0000;
+        color: white;
+    }
+    
+    /* Section headers */
+    h1, h2, h3 {
+        color: #212121;
+    }
+    
+    /* Video statistics styles */
+    .stats-container {
+        display: flex;
+        justify-content: space-between;
+        flex-wrap: wrap;
+    }
+    .stat-item {
+        text-align: center;
+        padding: 0.5rem;
+        flex: 1;
+        min-width: 100px;
+    }
+    
+    /* Recommendation box */
+    .recommendation-box {
+        background-color: #f8f9fa;
+        border-left: 4px solid #FF0000;
+        padding: 1rem;
+        margin-bottom: 1rem;
+    }
+    
+    /* Loading spinner */
+    .stSpinner > div > div {
+        border-top-color: #FF0000 !important;
+    }
+    
+    /* Make metric values stand out */
+    .big-metric {
+        font-size: 24px;
+        font-weight: bold;
+        color: #FF0000;
+    }
+    
+    /* Custom tag style */
+    .tag {
+        background-color: #e0e0e0;
+        padding: 5px 10px;
+        border-radius: 15px;
+        margin-right: 5px;
+        margin-bottom: 5px;
+        display: inline-block;
+        font-size: 0.8rem;
+    }
+    
+    /* Success metrics box */
+    .success-metric-box {
+        background-color: #f0f8ff;
+        border-radius: 8px;
+        padding: 1rem;
+        margin-bottom: 1rem;
+        border-left: 4px solid #4285f4;
+    }
+    
+    /* Custom expander styling */
+    .streamlit-expanderHeader {
+        font-weight: bold;
+        color: #212121;
+    }
+    
+    /* Thumbnail hover effect */
+    .thumbnail-container {
+        position: relative;
+        overflow: hidden;
+        border-radius: 8px;
+    }
+    .thumbnail-container img {
+        transition: transform 0.3s;
+    }
+    .thumbnail-container:hover img {
+        transform: scale(1.05);
+    }
+    
+    /* Video grid layout */
+    .video-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+        gap: 1rem;
+    }
+    
+    .recommendation-box, .success-metric-box {
+        height: 200px;
+        overflow-y: auto;
+    }
+"""
+
+def get_video_thumbnail(video_id):
+    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+def format_number(num):
+    if num >= 1000000:
+        return f"{num/1000000:.1f}M"
+    elif num >= 1000:
+        return f"{num/1000:.1f}K"
+    else:
+        return str(num)
+
+def escape_html(value):
+    # Escape once for a whole card; "$" would otherwise start a math block in st.markdown
+    text = html.escape(str(value), quote=True).replace("$", "&#36;")
+    return text.replace("\n", "<br>")
+
+def render_details_html(summary, content):
+    if isinstance(content, (dict, list)):
+        body = f"<pre>{escape_html(json.dumps(content, indent=2))}</pre>"
+    else:
+        body = f"<p>{escape_html(content)}</p>"
+    return f"<details><summary>{escape_html(summary)}</summary>{body}</details>"
+
+def render_video_card_html(video, heading=None, is_detailed=False):
+    # Template a whole card as one HTML string. Blank lines are avoided on purpose:
+    # they would end the HTML block and let markdown parse the rest.
+    video_url = escape_html(video.get('video_url') or '#')
+    parts = ['<div class="video-card">']
+    if heading:
+        parts.append(f"<h4>{escape_html(heading)}</h4>")
+    parts.append(
+        f'<div class="thumbnail-container"><a href="{video_url}" target="_blank">'
+        f'<img src="{escape_html(get_video_thumbnail(video["video_id"]))}" width="100%" alt="Video thumbnail">'
+        f'</a></div>'
+    )
+    parts.append(f'<h5><a href="{video_url}" target="_blank">{escape_html(video["title"])}</a></h5>')
+    
+    if 'statistics' in video:
+        stats = video['statistics']
+        parts.append('<div class="stats-container">')
+        for label, key in [("Views", 'views'), ("Likes", 'likes'), ("Comments", 'comments')]:
+            parts.append(
+                f'<div class="stat-item"><div>{label}</div>'
+                f'<div class="big-metric">{escape_html(format_number(stats.get(key, 0)))}</div></div>'
+            )
+        parts.append('</div>')
+    
+    if 'description' in video and len(video['description']) > 0:
+        description = video['description'][:300] + ("..." if len(video['description']) > 300 else "")
+        parts.append(render_details_html("Description", description))
+    
+    if is_detailed and 'analysis' in video:
+        parts.append(render_details_html("Content Analysis", video['analysis']))
+    
+    if is_detailed and 'current_trends' in video:
+        parts.append(render_details_html("Current Trends", video['current_trends']))
+        if 'future_trends' in video:
+            parts.append(render_details_html("Future Predictions", video['future_trends']))
+    
+    parts.append('</div>')
+    return "".join(parts)
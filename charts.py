@@ -0,0 +1,168 @@
+# Chart builders shared by the Streamlit UI and the headless entry points.
+# Nothing in here may import streamlit.
+import altair as alt
+import pandas as pd
+import plotly.graph_objects as go
+from wordcloud import WordCloud
+
+from downsample import downsample_frame, point_budget
+from metrics import top_keywords
+
+
+def create_wordcloud(keywords):
+    # Create word frequency dictionary
+    word_freq = {}
+    for item in keywords:
+        word_freq[item[0]] = item[1]
+
+    # Generate WordCloud
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        colormap='viridis',
+        max_words=100,
+        contour_width=1,
+        contour_color='steelblue'
+    ).generate_from_frequencies(word_freq)
+
+    return wordcloud
+
+def create_radar_chart(radar_metrics):
+    categories = list(radar_metrics.keys())
+    values = list(radar_metrics.values())
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        name='Performance',
+        line_color='#FF0000',
+        fillcolor='rgba(255, 0, 0, 0.2)'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )
+        ),
+        showlegend=False,
+        margin=dict(l=70, r=70, t=20, b=20),
+        height=300
+    )
+
+    return fig
+
+def create_keyword_chart(keywords):
+    # Create a bar chart for top keywords
+    keyword_df = pd.DataFrame(top_keywords(keywords), columns=['Keyword', 'Count'])
+
+    return alt.Chart(keyword_df).mark_bar().encode(
+        y=alt.Y('Keyword:N', sort='-x', title=None),
+        x=alt.X('Count:Q', title='Frequency'),
+        color=alt.Color('Count:Q', scale=alt.Scale(scheme='reds'), legend=None),
+        tooltip=['Keyword', 'Count']
+    ).properties(
+        height=300
+    )
+
+def create_views_chart(cumulative_views, width=None):
+    views_df = pd.DataFrame({
+        'Day': list(range(1, len(cumulative_views)+1)),
+        'Views': cumulative_views
+    })
+    # Long histories are reduced to about one point per pixel before they are inlined into the spec
+    views_df = downsample_frame(views_df, 'Day', 'Views', point_budget(width))
+
+    return alt.Chart(views_df).mark_area(
+        color='#FF0000',
+        opacity=0.3,
+        line={
+            'color': '#FF0000',
+            'size': 2
+        }
+    ).encode(
+        x=alt.X('Day:Q', title='Days Since Publishing'),
+        y=alt.Y('Views:Q', title='Cumulative Views'),
+        tooltip=['Day', alt.Tooltip('Views:Q', format=',')]
+    ).properties(
+        title='Projected View Growth',
+        height=250
+    )
+
+def create_engagement_chart(engagement_rows):
+    engagement_data = pd.DataFrame(engagement_rows)
+
+    engagement_df = pd.melt(
+        engagement_data,
+        id_vars=['Metric'],
+        value_vars=[column for column in ['Value', 'Benchmark', 'Top 25%'] if column in engagement_data],
+        var_name='Type',
+        value_name='Rate'
+    )
+
+    return alt.Chart(engagement_df).mark_bar().encode(
+        x=alt.X('Metric:N', title=None),
+        y=alt.Y('Rate:Q', title='Rate', axis=alt.Axis(format='.1%')),
+        color=alt.Color('Type:N', scale=alt.Scale(
+            domain=['Value', 'Benchmark', 'Top 25%'],
+            range=['#FF0000', '#757575', '#BDBDBD']
+        )),
+        tooltip=['Metric', 'Type', alt.Tooltip('Rate:Q', format='.2%')]
+    ).properties(
+        title='Engagement vs Benchmark',
+        height=250
+    )
+
+def create_bubble_chart(bubble_data):
+    bubble_df = pd.DataFrame(bubble_data)
+
+    # Create bubble chart
+    bubble_chart = alt.Chart(bubble_df).mark_circle().encode(
+        x=alt.X('x:Q', title='Interaction Rate (scaled)'),
+        y=alt.Y('y:Q', title='Percentage of Views', axis=alt.Axis(format='.1f')),
+        size=alt.Size('size:Q', legend=None),
+        color=alt.Color('color:N', scale=alt.Scale(
+            domain=['Likes', 'Comments', 'Engagement'],
+            range=['#FF0000', '#4285F4', '#FBBC05']
+        )),
+        tooltip=['metric',
+                alt.Tooltip('x:Q', title='Interaction Rate', format='.2f'),
+                alt.Tooltip('y:Q', title='% of Views', format='.2f')]
+    ).properties(
+        title='Engagement Bubble Analysis',
+        height=250
+    )
+
+    # Add text labels to each bubble
+    text = alt.Chart(bubble_df).mark_text(
+        align='center',
+        baseline='middle',
+        fontSize=11,
+        fontWeight='bold',
+        color='white'
+    ).encode(
+        x='x:Q',
+        y='y:Q',
+        text='metric:N'
+    )
+
+    # Combine chart and labels
+    return bubble_chart + text
+
+def create_cooccurrence_heatmap(keywords, cooccurrence_rows):
+    cooccurrence_df = pd.DataFrame(cooccurrence_rows, columns=['Keyword', 'Co-keyword', 'Videos'])
+
+    return alt.Chart(cooccurrence_df).mark_rect().encode(
+        x=alt.X('Keyword:N', sort=keywords, title=None),
+        y=alt.Y('Co-keyword:N', sort=keywords, title=None),
+        color=alt.Color('Videos:Q', scale=alt.Scale(scheme='reds'), title='Videos'),
+        tooltip=['Keyword', 'Co-keyword', 'Videos']
+    ).properties(
+        title='Keywords Appearing Together',
+        height=400
+    )
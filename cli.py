@@ -0,0 +1,197 @@
+# Headless batch runner for the analysis pipeline.
+# Computes the same metrics, keywords and projections as the Streamlit UI without importing it:
+#
+#   python cli.py --prompt "AI Agents" --region IN --region US --out-dir out
+#   python cli.py --prompts-file prompts.txt --region IN --format json parquet --charts
+#   python cli.py --prompts-file prompts.txt --region IN --report html
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api_client import API_URL, CONTENT_TYPES, REGION_CODES, AnalysisClient
+from metrics import compute_payload_metrics
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:60] or "analysis"
+
+def output_name(prompt, region_code, content_type):
+    # The slug keeps names readable; the hash of the full prompt keeps prompts that slug alike apart
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    return f"{slugify(prompt)}-{digest}-{region_code}-{content_type}"
+
+def read_prompts(args):
+    prompts = list(args.prompt or [])
+    if args.prompts_file:
+        with open(args.prompts_file, "r", encoding="utf-8") as f:
+            prompts.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    return prompts
+
+def write_charts(results, out_dir, max_workers):
+    # Same matplotlib rasterizer as the static reports: every chart of the batch is
+    # rendered once, spread over `max_workers` processes, and written as PNG
+    from report import chart_jobs, chart_key, rasterize_charts
+
+    jobs = {result["name"]: chart_jobs(result["metrics"]) for result in results}
+    images = rasterize_charts([job for result_jobs in jobs.values() for job in result_jobs], max_workers=max_workers)
+
+    written = []
+    for name, result_jobs in jobs.items():
+        chart_dir = os.path.join(out_dir, "charts", name)
+        os.makedirs(chart_dir, exist_ok=True)
+        video = 0
+        for kind, data in result_jobs:
+            if kind == "radar":
+                video += 1
+            stem = kind if kind in ("wordcloud", "keywords") else f"video{video}-{kind}"
+            path = os.path.join(chart_dir, stem + ".png")
+            with open(path, "wb") as f:
+                f.write(images[chart_key(kind, data)])
+            written.append(path)
+    return written
+
+def write_parquet(results, out_dir):
+    import pandas as pd
+
+    video_rows = []
+    keyword_rows = []
+    for result in results:
+        params = {key: result[key] for key in ("prompt", "region_code", "content_type")}
+        for video in result['metrics']['videos']:
+            row = {**params, **{k: v for k, v in video.items() if not isinstance(v, (dict, list))}}
+            video_rows.append(row)
+        for keyword, count in result['metrics']['keywords']:
+            keyword_rows.append({**params, "keyword": keyword, "count": count})
+
+    paths = []
+    for name, rows in (("videos", video_rows), ("keywords", keyword_rows)):
+        path = os.path.join(out_dir, f"{name}.parquet")
+        pd.DataFrame(rows).to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run YouTube trend analyses without the web UI.")
+    parser.add_argument("--prompt", action="append", help="Content description to analyze (repeatable)")
+    parser.add_argument("--prompts-file", help="File with one prompt per line")
+    parser.add_argument("--region", action="append", choices=REGION_CODES, help="Region code (repeatable, default IN)")
+    parser.add_argument("--content-type", action="append", choices=CONTENT_TYPES, help="Content type (repeatable, default both)")
+    parser.add_argument("--out-dir", default="analysis_output", help="Directory for outputs")
+    parser.add_argument("--format", nargs="+", choices=["json", "parquet"], default=["json"], help="Output formats")
+    parser.add_argument("--charts", action="store_true", help="Also write chart images")
+    parser.add_argument("--report", choices=["html", "pdf"], help="Also write a static report per analysis")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent backend requests")
+    parser.add_argument("--workers", type=int, help="Processes used for chart rendering (default: CPUs available)")
+    parser.add_argument("--api-url", default=os.environ.get("YTA_API_URL", API_URL))
+    parser.add_argument("--timeout", type=int, default=300)
+    parser.add_argument("--benchmark-path", default=os.environ.get("YTA_BENCHMARK_PATH", ".yta_benchmarks.json"),
+                        help="Shared engagement benchmark file (use an empty value to disable)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible view projections")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    prompts = read_prompts(args)
+    if not prompts:
+        print("No prompts given. Use --prompt or --prompts-file.", file=sys.stderr)
+        return 2
+
+    # Keyed by output name, so a repeated prompt/region/content type runs once instead of
+    # overwriting its own outputs
+    jobs = {}
+    for prompt in prompts:
+        for region_code in (args.region or ["IN"]):
+            for content_type in (args.content_type or ["both"]):
+                name = output_name(prompt, region_code, content_type)
+                if name in jobs:
+                    print(f"[skipped] duplicate {prompt!r} {region_code}/{content_type}", file=sys.stderr)
+                    continue
+                jobs[name] = (prompt, region_code, content_type)
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    benchmarks = None
+    if args.benchmark_path:
+        from benchmarks import BenchmarkStore
+        benchmarks = BenchmarkStore(args.benchmark_path)
+
+    client = AnalysisClient(url=args.api_url, timeout=args.timeout)
+    results = []
+    failures = 0
+    started = time.monotonic()
+
+    # Backend calls are I/O bound, so threads are enough to keep `concurrency` requests in flight
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = {pool.submit(client.analyze, *job): name for name, job in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            prompt, region_code, content_type = jobs[name]
+            # One bad job must not take the rest of the batch down with it
+            try:
+                data = future.result()
+                if benchmarks is not None:
+                    benchmarks.observe(data, region_code, content_type)
+                # One generator per job, so a job's projections do not depend on completion order
+                rng = random.Random(f"{args.seed}:{name}") if args.seed is not None else None
+                result = {
+                    "prompt": prompt,
+                    "region_code": region_code,
+                    "content_type": content_type,
+                    "name": name,
+                    "metrics": compute_payload_metrics(data, benchmarks, region_code, content_type, rng=rng),
+                    "marketing_strategy": data,
+                }
+                # Written as soon as the job completes, so an interrupted batch keeps what it finished
+                if "json" in args.format:
+                    with open(os.path.join(args.out_dir, result["name"] + ".json"), "w", encoding="utf-8") as f:
+                        json.dump(result, f, indent=2)
+            except Exception as e:
+                failures += 1
+                print(f"[failed] {prompt!r} {region_code}/{content_type}: {e}", file=sys.stderr)
+                continue
+            results.append(result)
+            print(f"[done] {prompt!r} {region_code}/{content_type}", file=sys.stderr)
+
+    if "parquet" in args.format and results:
+        try:
+            write_parquet(results, args.out_dir)
+        except ImportError as e:
+            print(f"Parquet output needs pyarrow or fastparquet: {e}", file=sys.stderr)
+            failures += 1
+
+    if args.charts and results:
+        try:
+            write_charts(results, args.out_dir, args.workers)
+        except Exception as e:
+            print(f"Chart rendering failed: {e}", file=sys.stderr)
+            failures += 1
+
+    if args.report and results:
+        from report import ReportError, export_reports
+        try:
+            reports = export_reports(
+                [(f"{r['prompt']} ({r['region_code']}, {r['content_type']})", r["marketing_strategy"], r["metrics"])
+                 for r in results],
+                fmt=args.report,
+                max_workers=args.workers
+            )
+        except ReportError as e:
+            print(str(e), file=sys.stderr)
+            failures += 1
+        else:
+            for result, report_bytes in zip(results, reports):
+                with open(os.path.join(args.out_dir, f"{result['name']}.{args.report}"), "wb") as f:
+                    f.write(report_bytes)
+
+    print(f"{len(results)} analyses written to {args.out_dir} in {time.monotonic() - started:.1f}s, "
+          f"{failures} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
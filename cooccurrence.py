@@ -0,0 +1,86 @@
+# Keyword co-occurrence across the videos of a payload, built from a sparse
+# video x keyword matrix so thousands of videos and tens of thousands of distinct
+# tokens never need a dense matrix or a loop over keyword pairs.
+# Nothing in here may import streamlit.
+import re
+
+import numpy as np
+from scipy import sparse
+
+from metrics import iter_payload_videos
+
+TOKEN_PATTERN = re.compile(r"#?[a-z0-9][a-z0-9+'#-]*[a-z0-9+#]")
+STOPWORDS = {
+    "the", "and", "for", "you", "your", "with", "this", "that", "are", "how", "what", "why",
+    "from", "was", "will", "can", "all", "new", "not", "but", "out", "our", "its", "has",
+    "have", "into", "about", "more", "just", "get", "one", "top", "video", "videos", "shorts",
+}
+
+
+def video_keywords(video):
+    # Backend tags when present, otherwise the words of the title
+    tags = video.get('tags')
+    if tags:
+        tokens = [str(tag).lower().strip() for tag in tags]
+    else:
+        tokens = TOKEN_PATTERN.findall(str(video.get('title', '')).lower())
+    keywords = {token.lstrip('#') for token in tokens}
+    return {keyword for keyword in keywords if len(keyword) >= 2 and keyword not in STOPWORDS}
+
+def build_video_keyword_matrix(videos):
+    # Binary CSR matrix with one row per video and one column per distinct keyword
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    for video in videos:
+        # Sorted so column order, and ties between equally common keywords, are stable
+        for token in sorted(video_keywords(video)):
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(videos), len(vocabulary))
+    )
+    terms = [None] * len(vocabulary)
+    for token, column in vocabulary.items():
+        terms[column] = token
+    return matrix, terms
+
+def compute_cooccurrence(data, max_keywords=5000):
+    # Co-occurrence counts for the `max_keywords` most frequent keywords in a payload.
+    # Returns (counts, terms, doc_freq), where counts is a symmetric CSR matrix with
+    # an empty diagonal and doc_freq is the number of videos carrying each keyword.
+    videos = []
+    seen = set()
+    for video in iter_payload_videos(data):
+        video_id = video.get('video_id')
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        videos.append(video)
+
+    matrix, terms = build_video_keyword_matrix(videos)
+    doc_freq = np.asarray(matrix.sum(axis=0)).ravel()
+    if len(terms) > max_keywords:
+        keep = np.argsort(-doc_freq, kind='stable')[:max_keywords]
+        matrix = matrix[:, keep]
+        terms = [terms[i] for i in keep]
+        doc_freq = doc_freq[keep]
+
+    counts = (matrix.T @ matrix).tocsr()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+    return counts, terms, doc_freq
+
+def top_cooccurrences(counts, terms, doc_freq, max_nodes=20, min_count=1):
+    # Prune to the most frequent keywords and return (keywords, pair rows) for charting
+    nodes = np.argsort(-doc_freq, kind='stable')[:max_nodes]
+    sub = counts[nodes][:, nodes].tocoo()
+    mask = sub.data >= min_count
+    keywords = [terms[i] for i in nodes]
+    rows = [
+        {'Keyword': keywords[i], 'Co-keyword': keywords[j], 'Videos': int(count)}
+        for i, j, count in zip(sub.row[mask], sub.col[mask], sub.data[mask])
+    ]
+    return keywords, rows
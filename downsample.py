@@ -0,0 +1,114 @@
+# Downsampling for time-series charts, so Vega-Lite specs and plot payloads stay bounded
+# however long the series gets. Nothing in here may import streamlit.
+#
+#   python downsample.py   # benchmark on million-point series
+import numpy as np
+
+# A point per horizontal pixel is the most a line chart can show
+DEFAULT_CHART_WIDTH = 800
+POINTS_PER_PIXEL = 1
+
+
+def point_budget(width=None, points_per_pixel=POINTS_PER_PIXEL):
+    return max(3, int((width or DEFAULT_CHART_WIDTH) * points_per_pixel))
+
+def lttb(x, y, max_points):
+    # Largest-Triangle-Three-Buckets (Steinarsson, 2013). Keeps the first and last points and,
+    # from each bucket in between, the point that forms the largest triangle with the point
+    # kept from the previous bucket and the average of the next one. Returns kept indices.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    kept = np.empty(max_points, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    # Averages of every bucket, computed once, serve as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        areas = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+    return kept
+
+def minmax(x, y, max_points):
+    # Keeps the minimum and maximum of each bucket, which preserves spikes exactly.
+    # Fully vectorized, so it is the cheaper choice for very long series.
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    buckets = (max_points - 2) // 2  # Two points per bucket, plus the first and last point
+    if max_points >= n or buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // buckets)  # ceil
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lows = offsets + np.nanargmin(np.where(np.isnan(grid), np.inf, grid), axis=1)
+    highs = offsets + np.nanargmax(np.where(np.isnan(grid), -np.inf, grid), axis=1)
+    kept = np.unique(np.concatenate([[0, n - 1], lows, highs]))
+    return kept[kept < n]
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+def downsample(x, y, max_points=None, method="lttb"):
+    # Returns (x, y) reduced to at most max_points points (default: one per pixel of chart width)
+    x = np.asarray(x)
+    y = np.asarray(y)
+    kept = METHODS[method](x, y, max_points or point_budget())
+    return x[kept], y[kept]
+
+def downsample_frame(df, x, y, max_points=None, series=None, method="lttb"):
+    # Same as downsample() for a DataFrame, applied per series so each line keeps its own budget
+    max_points = max_points or point_budget()
+    if series is None:
+        if len(df) <= max_points:
+            return df
+        df = df.sort_values(x)
+        return df.iloc[METHODS[method](df[x].to_numpy(), df[y].to_numpy(), max_points)]
+
+    import pandas as pd
+
+    parts = [downsample_frame(group, x, y, max_points, method=method) for _, group in df.groupby(series, sort=False)]
+    return pd.concat(parts) if parts else df
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    import altair as alt
+    import pandas as pd
+
+    alt.data_transformers.disable_max_rows()
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    xs = np.arange(n, dtype=float)
+    ys = np.cumsum(rng.normal(size=n)) + 50 * np.sin(xs / 20_000)
+
+    full_spec = len(json.dumps(alt.Chart(pd.DataFrame({"Day": xs[:100_000], "Views": ys[:100_000]}))
+                               .mark_line().encode(x="Day:Q", y="Views:Q")
+                               .properties(width=DEFAULT_CHART_WIDTH).to_dict(validate=False)))
+    print(f"Vega-Lite spec for 100k raw points: {full_spec / 1e6:.1f} MB")
+    for method in METHODS:
+        for budget in (point_budget(), point_budget(2000)):
+            started = time.perf_counter()
+            dx, dy = downsample(xs, ys, budget, method=method)
+            elapsed = time.perf_counter() - started
+            spec = len(json.dumps(alt.Chart(pd.DataFrame({"Day": dx, "Views": dy}))
+                                  .mark_line().encode(x="Day:Q", y="Views:Q").to_dict(validate=False)))
+            print(f"{method:>6} {n:,} -> {len(dx):,} points in {elapsed * 1000:.0f} ms, spec {spec / 1e3:.0f} KB")
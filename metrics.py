@@ -0,0 +1,180 @@
+# Per-video metrics shared by the Streamlit UI and the other entry points.
+# Nothing in here may import streamlit.
+import random
+
+
+def compute_views_per_day(stats):
+    # Fall back to total views over video age when the backend didn't provide a rate
+    views_per_day = stats.get('views_per_day', 0)
+    if not views_per_day:
+        video_age_days = stats.get('video_age_days', 0) or 1  # Avoid division by zero
+        views_per_day = stats.get('views', 0) / video_age_days
+    return views_per_day
+
+def compute_engagement_rates(stats):
+    views = max(1, stats.get('views', 0))  # Avoid division by zero
+    like_view_ratio = stats.get('likes', 0) / views
+    comment_view_ratio = stats.get('comments', 0) / views
+
+    # engagement_rate comes from the backend as a percentage
+    engagement_rate = stats.get('engagement_rate', 0) / 100
+    if engagement_rate == 0:
+        engagement_rate = (like_view_ratio + comment_view_ratio) / 2
+
+    return {
+        'like_view': like_view_ratio,
+        'comment_view': comment_view_ratio,
+        'engagement': engagement_rate,
+    }
+
+def iter_payload_videos(data, with_group=False):
+    # Every video in a marketing_strategy payload, analyzed videos first
+    videos = data.get('videos', {})
+    for video in videos.get('analyzed_videos', []):
+        yield ('analyzed', video) if with_group else video
+    for group in ('trending', 'search'):
+        for video in videos.get('top_matches', {}).get(group, []):
+            yield (group, video) if with_group else video
+
+RADAR_BENCHMARK_METRICS = {
+    'Engagement Rate': 'engagement',
+    'Like/View Ratio': 'like_view',
+    'Comment/View Ratio': 'comment_view',
+    'Views/Day': 'views_per_day'
+}
+
+# Industry benchmarks, used until enough videos have been seen for a region/content type
+DEFAULT_BENCHMARKS = {
+    'like_view': 0.05,  # 5% likes per view
+    'comment_view': 0.01,  # 1% comments per view
+    'engagement': 0.06  # 6% overall engagement
+}
+
+def top_keywords(keywords, n=10):
+    return sorted(keywords, key=lambda x: x[1], reverse=True)[:n]
+
+def compute_radar_metrics(stats, percentile_ranks=None):
+    # Normalize metrics to 0-1 for the radar chart
+    metrics = {
+        'View/Sub Ratio': min(1.0, stats['views'] / (stats.get('subscribers') or 100000)),
+        'Engagement Rate': stats['engagement_rate']/10,
+        'Like/View Ratio': stats['likes'] / stats['views']*10 if stats['views'] > 0 else 0,
+        'Comment/View Ratio': stats['comments'] / stats['views']*100 if stats['views'] > 0 else 0,
+        'Views/Day': min(1.0, stats.get('views_per_day', 0) / 500000)
+    }
+
+    # Prefer the video's percentile among everything seen in its region/content type
+    if percentile_ranks:
+        for axis, metric in RADAR_BENCHMARK_METRICS.items():
+            if percentile_ranks.get(metric) is not None:
+                metrics[axis] = percentile_ranks[metric]
+    return metrics
+
+def project_view_growth(stats, days=30, rng=None):
+    # Cumulative views for a plausible growth curve; pass a seeded rng for reproducible output
+    rng = rng or random
+    views_per_day = max(1, compute_views_per_day(stats))  # Minimum 1 view per day
+
+    # Generate a more realistic view growth pattern
+    view_multipliers = [rng.uniform(0.1, 10) for _ in range(5)] + \
+                    [rng.uniform(0.1, 1.2) for _ in range(15)] + \
+                    [rng.uniform(0.1, 1.0) for _ in range(days - 20)]
+    rng.shuffle(view_multipliers)
+
+    cumulative_views = []
+    total = 0
+    for d in range(days):
+        # Add randomness to daily views with more variance at the beginning
+        total += max(1, views_per_day * view_multipliers[d])
+        cumulative_views.append(total)
+    return cumulative_views
+
+def compute_engagement_comparison(stats, percentiles=None):
+    # Rows for the engagement-vs-benchmark chart. percentiles maps metric -> {quantile: value}
+    rates = compute_engagement_rates(stats)
+    percentiles = percentiles or {}
+    metrics = [('Like/View', 'like_view'), ('Comment/View', 'comment_view'), ('Overall Engagement', 'engagement')]
+    have_percentiles = all(percentiles.get(metric) for _, metric in metrics)
+
+    rows = []
+    for label, metric in metrics:
+        row = {
+            'Metric': label,
+            'Value': rates[metric],
+            'Benchmark': percentiles[metric][0.5] if percentiles.get(metric) else DEFAULT_BENCHMARKS[metric]
+        }
+        if have_percentiles:
+            # Median is shown as the benchmark, alongside the top-quartile cutoff
+            row['Top 25%'] = percentiles[metric][0.75]
+        rows.append(row)
+    return rows
+
+def compute_bubble_data(stats):
+    # Show relationship between: Views, Likes, Comments, and Engagement Rate
+    views = max(1, stats['views'])
+    likes = stats['likes']
+    comments = stats['comments']
+    engagement_rate = stats.get('engagement_rate', 0)
+    if engagement_rate == 0:
+        engagement_rate = ((likes / views) + (comments / views)) / 2 * 100
+
+    return [
+        {"metric": "Likes-Comments Ratio", "x": likes / max(1, comments), "y": likes / max(1, views) * 100,
+        "size": (likes / max(1, views) * 100)**2, "color": "Likes"},
+        {"metric": "Comments-Views Ratio", "x": comments / max(1, views) * 1000, "y": comments / max(1, likes) * 100,
+        "size": (comments / max(1, views) * 100)*100, "color": "Comments"},
+        {"metric": "Overall Engagement", "x": engagement_rate / 10, "y": (likes + comments) / max(1, views) * 100,
+        "size": engagement_rate**2, "color": "Engagement"}
+    ]
+
+def compute_payload_metrics(data, benchmarks=None, region_code=None, content_type=None, rng=None):
+    # Everything the UI derives from one payload, as plain JSON-serializable data.
+    # benchmarks is an optional BenchmarkStore used for percentiles and percentile ranks.
+    keywords = data.get('marketing_tactics', {}).get('recommended_tags_and_keywords', [])
+    percentiles = {}
+    if benchmarks is not None:
+        percentiles = {
+            metric: benchmarks.percentiles(metric, region_code, content_type)
+            for metric in DEFAULT_BENCHMARKS
+        }
+
+    videos = []
+    for group, video in iter_payload_videos(data, with_group=True):
+        row = {
+            'group': group,
+            'video_id': video.get('video_id'),
+            'title': video.get('title'),
+            'video_url': video.get('video_url'),
+        }
+        stats = video.get('statistics')
+        if stats:
+            rates = compute_engagement_rates(stats)
+            rates['views_per_day'] = compute_views_per_day(stats)
+            percentile_ranks = None
+            if benchmarks is not None:
+                percentile_ranks = {
+                    metric: benchmarks.percentile_rank(metric, value, region_code, content_type)
+                    for metric, value in rates.items()
+                }
+            row.update({
+                'views': stats.get('views', 0),
+                'likes': stats.get('likes', 0),
+                'comments': stats.get('comments', 0),
+                **rates,
+                'percentile_ranks': percentile_ranks,
+            })
+            if group == 'analyzed':
+                # The detailed charts are only drawn for analyzed videos
+                row.update({
+                    'radar': compute_radar_metrics(stats, percentile_ranks),
+                    'projected_views': project_view_growth(stats, rng=rng),
+                    'engagement_comparison': compute_engagement_comparison(stats, percentiles),
+                    'bubbles': compute_bubble_data(stats),
+                })
+        videos.append(row)
+
+    return {
+        'keywords': [list(item) for item in keywords],
+        'top_keywords': [list(item) for item in top_keywords(keywords)],
+        'videos': videos,
+    }
@@ -0,0 +1,330 @@
+# Static HTML/PDF export of an analysis, covering the same four sections as the UI tabs.
+# Charts are rasterized to PNG with matplotlib in a process pool, so a whole batch of
+# reports renders in parallel without a browser, vl-convert or kaleido.
+# Nothing in here may import streamlit.
+import base64
+import hashlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from cards import APP_CSS, escape_html, render_video_card_html
+from downsample import downsample, point_budget
+from metrics import iter_payload_videos, top_keywords
+
+REPORT_FORMATS = ["html", "pdf"]
+
+# Rendered PNGs keyed by chart kind + data hash, reused across reports and reruns
+_image_cache = OrderedDict()
+_image_cache_lock = threading.Lock()
+IMAGE_CACHE_SIZE = 512
+
+# Spawning a worker and importing matplotlib in it costs more than drawing a few charts
+# (about 2.5s for a fresh two-worker pool against 0.5s to draw one report's six charts
+# serially), so small batches are drawn in-process
+MIN_PARALLEL_CHARTS = 16
+
+# One long-lived pool per process, so repeated batches reuse warm workers
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+class ReportError(Exception):
+    pass
+
+
+def _figure_png(fig):
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+def _render_wordcloud(keywords):
+    from charts import create_wordcloud
+
+    buffer = io.BytesIO()
+    create_wordcloud(keywords).to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def _render_keywords(keywords):
+    import matplotlib.pyplot as plt
+
+    sorted_keywords = top_keywords(keywords)[::-1]
+    fig, ax = plt.subplots(figsize=(5, 4))
+    counts = [count for _, count in sorted_keywords]
+    ax.barh([keyword for keyword, _ in sorted_keywords], counts,
+            color=plt.cm.Reds([0.3 + 0.7 * count / max(counts) for count in counts]))
+    ax.set_xlabel("Frequency")
+    return _figure_png(fig)
+
+def _render_radar(radar_metrics):
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    categories = list(radar_metrics.keys())
+    values = [min(1.0, max(0.0, value)) for value in radar_metrics.values()]
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+    fig, ax = plt.subplots(figsize=(4, 4), subplot_kw={"polar": True})
+    ax.fill(angles + angles[:1], values + values[:1], color="#FF0000", alpha=0.2)
+    ax.plot(angles + angles[:1], values + values[:1], color="#FF0000")
+    ax.set_xticks(angles)
+    ax.set_xticklabels(categories, fontsize=8)
+    ax.set_ylim(0, 1)
+    return _figure_png(fig)
+
+def _render_views(cumulative_views):
+    import matplotlib.pyplot as plt
+
+    days, cumulative_views = downsample(range(1, len(cumulative_views) + 1), cumulative_views, point_budget(500))
+    fig, ax = plt.subplots(figsize=(5, 3))
+    ax.fill_between(days, cumulative_views, color="#FF0000", alpha=0.3)
+    ax.plot(days, cumulative_views, color="#FF0000", linewidth=2)
+    ax.set_title("Projected View Growth")
+    ax.set_xlabel("Days Since Publishing")
+    ax.set_ylabel("Cumulative Views")
+    return _figure_png(fig)
+
+def _render_engagement(engagement_rows):
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import PercentFormatter
+
+    series = [(column, color) for column, color in
+              [("Value", "#FF0000"), ("Benchmark", "#757575"), ("Top 25%", "#BDBDBD")]
+              if column in engagement_rows[0]]
+    width = 0.8 / len(series)
+    fig, ax = plt.subplots(figsize=(5, 3))
+    for i, (column, color) in enumerate(series):
+        ax.bar([x + i * width for x in range(len(engagement_rows))],
+               [row[column] for row in engagement_rows], width=width, color=color, label=column)
+    ax.set_xticks([x + width * (len(series) - 1) / 2 for x in range(len(engagement_rows))])
+    ax.set_xticklabels([row["Metric"] for row in engagement_rows], fontsize=8)
+    ax.yaxis.set_major_formatter(PercentFormatter(1.0))
+    ax.set_title("Engagement vs Benchmark")
+    ax.legend(fontsize=8)
+    return _figure_png(fig)
+
+def _render_bubbles(bubble_data):
+    import matplotlib.pyplot as plt
+
+    colors = {"Likes": "#FF0000", "Comments": "#4285F4", "Engagement": "#FBBC05"}
+    largest = max(1e-9, max(bubble["size"] for bubble in bubble_data))
+    fig, ax = plt.subplots(figsize=(5, 3))
+    for bubble in bubble_data:
+        ax.scatter(bubble["x"], bubble["y"], s=200 + 1800 * bubble["size"] / largest,
+                   color=colors[bubble["color"]], alpha=0.8)
+        ax.annotate(bubble["metric"], (bubble["x"], bubble["y"]), ha="center", va="center", fontsize=7)
+    ax.set_title("Engagement Bubble Analysis")
+    ax.set_xlabel("Interaction Rate (scaled)")
+    ax.set_ylabel("Percentage of Views")
+    return _figure_png(fig)
+
+RENDERERS = {
+    "wordcloud": _render_wordcloud,
+    "keywords": _render_keywords,
+    "radar": _render_radar,
+    "views": _render_views,
+    "engagement": _render_engagement,
+    "bubbles": _render_bubbles,
+}
+
+def _render_chart(kind, data):
+    import matplotlib
+    matplotlib.use("Agg")
+    return RENDERERS[kind](data)
+
+def chart_key(kind, data):
+    canonical = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{kind}:{canonical}".encode("utf-8")).hexdigest()
+
+def available_cpus():
+    # CPUs this process may run on, which respects container and taskset limits
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                # Work already submitted to the old pool still finishes
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def chart_jobs(metrics):
+    # (kind, data) pairs for every chart shown in the report
+    jobs = []
+    if metrics["keywords"]:
+        jobs.append(("wordcloud", metrics["keywords"]))
+        jobs.append(("keywords", metrics["keywords"]))
+    for video in metrics["videos"]:
+        if video["group"] == "analyzed" and "radar" in video:
+            jobs.append(("radar", video["radar"]))
+            jobs.append(("views", video["projected_views"]))
+            jobs.append(("engagement", video["engagement_comparison"]))
+            jobs.append(("bubbles", video["bubbles"]))
+    return jobs
+
+def rasterize_charts(jobs, max_workers=None):
+    # Returns {chart key: PNG bytes}. Cached charts are reused. Large batches are
+    # rendered in parallel by workers that are spawned rather than forked, which
+    # is safe inside the multi-threaded Streamlit server.
+    images = {}
+    pending = {}
+    with _image_cache_lock:
+        for kind, data in jobs:
+            key = chart_key(kind, data)
+            if key in _image_cache:
+                _image_cache.move_to_end(key)
+                images[key] = _image_cache[key]
+            else:
+                pending[key] = (kind, data)
+
+    if pending:
+        workers = max_workers or available_cpus()
+        if workers <= 1 or len(pending) < MIN_PARALLEL_CHARTS:
+            rendered = {key: _render_chart(kind, data) for key, (kind, data) in pending.items()}
+        else:
+            pool = _get_pool(workers)
+            futures = {key: pool.submit(_render_chart, kind, data) for key, (kind, data) in pending.items()}
+            rendered = {key: future.result() for key, future in futures.items()}
+
+        with _image_cache_lock:
+            for key, png in rendered.items():
+                _image_cache[key] = png
+                while len(_image_cache) > IMAGE_CACHE_SIZE:
+                    _image_cache.popitem(last=False)
+        images.update(rendered)
+    return images
+
+def _img(images, kind, data, alt):
+    encoded = base64.b64encode(images[chart_key(kind, data)]).decode("ascii")
+    return f'<img class="report-chart" src="data:image/png;base64,{encoded}" alt="{escape_html(alt)}">'
+
+def _box(title, content, css_class="recommendation-box"):
+    return f'<div class="{css_class}"><h4>{escape_html(title)}</h4><p>{escape_html(content)}</p></div>'
+
+def build_report_html(data, metrics, images, title="YouTube Trends Analysis"):
+    tactics = data.get('marketing_tactics', {})
+    trends = data.get('trend_analysis', {})
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{escape_html(title)}</title>",
+        f"<style>{APP_CSS}",
+        "body { font-family: sans-serif; margin: 2rem; }",
+        ".report-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }",
+        ".report-chart { max-width: 100%; }",
+        ".recommendation-box, .success-metric-box { height: auto; }",
+        "</style></head><body>",
+        f'<div class="header-container"><h1>🎬 {escape_html(title)}</h1>'
+        f'<p>Generated {datetime.now():%Y-%m-%d %H:%M}</p></div>',
+    ]
+
+    # Overview
+    parts.append("<h2>📊 Content Strategy Overview</h2><div class='report-grid'>")
+    parts.append(_box("🎯 Target Audience", data.get('target_audience', 'Not specified')))
+    parts.append(_box("🚀 Intent", data.get('overall_goal', 'Not specified')))
+    parts.append("</div>")
+    if metrics["keywords"]:
+        parts.append("<h3>🔑 Top Keywords Analysis</h3><div class='report-grid'>")
+        parts.append(_img(images, "wordcloud", metrics["keywords"], "Keyword word cloud"))
+        parts.append(_img(images, "keywords", metrics["keywords"], "Top keywords"))
+        parts.append("</div>")
+    parts.append("<h3>🔮 Trend Analysis</h3><div class='report-grid'>")
+    parts.append(_box("📊 Current Trends", trends.get('current_trends', 'Not specified')))
+    parts.append(_box("🚀 Future Predictions", trends.get('future_predictions', 'Not specified')))
+    parts.append("</div>")
+
+    # Analyzed videos
+    parts.append("<h2>🎥 Analyzed Videos</h2>")
+    analyzed = data.get('videos', {}).get('analyzed_videos', [])
+    analyzed_metrics = [video for video in metrics["videos"] if video["group"] == "analyzed"]
+    for i, (video, video_metrics) in enumerate(zip(analyzed, analyzed_metrics)):
+        heading = f"Video {i+1}: {'Trending' if i==0 else 'Search'} Analysis"
+        parts.append(render_video_card_html(video, heading=heading, is_detailed=True))
+        if "radar" in video_metrics:
+            parts.append("<div class='report-grid'>")
+            parts.append(_img(images, "radar", video_metrics["radar"], "Performance radar"))
+            parts.append(_img(images, "views", video_metrics["projected_views"], "Projected view growth"))
+            parts.append(_img(images, "engagement", video_metrics["engagement_comparison"], "Engagement vs benchmark"))
+            parts.append(_img(images, "bubbles", video_metrics["bubbles"], "Engagement bubbles"))
+            parts.append("</div>")
+    if not analyzed:
+        parts.append("<p>No analyzed videos available</p>")
+
+    # Content strategy
+    parts.append("<h2>📈 Content Strategy Recommendations</h2>")
+    content_recs = data.get('content_recommendations', {})
+    if content_recs.get('content_types'):
+        parts.append("<h3>🎬 Recommended Content Types</h3><div>")
+        parts.extend(f'<span class="tag">{escape_html(content_type)}</span>' for content_type in content_recs['content_types'])
+        parts.append("</div>")
+    parts.append("<div class='report-grid'>")
+    for label, key in [("🎨 Visual Style", 'visual_style'), ("🎵 Audio/Music", 'audio_music'),
+                       ("📖 Storytelling Approach", 'storytelling_approach'),
+                       ("✂️ Editing Style & Pacing", 'editing_style_and_pacing')]:
+        if content_recs:
+            parts.append(_box(label, content_recs.get(key, 'Not specified')))
+    for label, key in [("📝 Title & Description Optimization", 'title_and_description_optimization'),
+                       ("🖼️ Thumbnail Design", 'thumbnail_design_recommendations'),
+                       ("⏰ Best Posting Times & Frequency", 'best_posting_times_and_frequency'),
+                       ("👥 Audience Engagement Strategies", 'audience_engagement_strategies')]:
+        if tactics:
+            parts.append(_box(label, tactics.get(key, 'Not specified')))
+    success_metrics = data.get('success_metrics', {})
+    for label, key in [("📏 How to Measure Effectiveness", 'how_to_measure_effectiveness'),
+                       ("👁️ Expected Engagement Patterns", 'expected_engagement_patterns'),
+                       ("📈 Growth Opportunities", 'growth_opportunities')]:
+        if success_metrics:
+            parts.append(_box(label, success_metrics.get(key, 'Not specified'), "success-metric-box"))
+    parts.append("</div>")
+
+    # All videos
+    parts.append("<h2>🔍 All Videos</h2>")
+    for group, label in [("trending", "Trending Matches"), ("search", "Search Matches")]:
+        videos = [video for video_group, video in iter_payload_videos(data, with_group=True) if video_group == group]
+        if videos:
+            parts.append(f"<h3>{label}</h3><div class='video-grid'>")
+            parts.extend(render_video_card_html(video) for video in videos)
+            parts.append("</div>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+def check_report_format(fmt):
+    # Raises ReportError up front when reports cannot be rendered in `fmt` here
+    if fmt not in REPORT_FORMATS:
+        raise ReportError(f"Unknown report format: {fmt}")
+    if fmt == "pdf" and importlib.util.find_spec("weasyprint") is None:
+        raise ReportError("PDF export needs the optional weasyprint package")
+
+def render_report(html_report, fmt="html"):
+    check_report_format(fmt)
+    if fmt == "pdf":
+        from weasyprint import HTML
+        return HTML(string=html_report).write_pdf()
+    return html_report.encode("utf-8")
+
+def export_reports(analyses, fmt="html", max_workers=None):
+    # analyses is a list of (title, marketing_strategy, metrics) tuples, metrics as returned by
+    # metrics.compute_payload_metrics. Charts for the whole batch share one process pool.
+    jobs = [job for _, _, metrics in analyses for job in chart_jobs(metrics)]
+    images = rasterize_charts(jobs, max_workers=max_workers)
+    return [
+        render_report(build_report_html(data, metrics, images, title=title), fmt)
+        for title, data, metrics in analyses
+    ]
+
+def export_report(title, data, metrics, fmt="html", max_workers=None):
+    return export_reports([(title, data, metrics)], fmt=fmt, max_workers=max_workers)[0]
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+
+
+def payload_key(payload):
+    # Content hash of the canonical JSON form, so identical analyses share a key
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def deep_sizeof(obj, seen=None):
+    # Approximate retained size of a parsed JSON payload, counting shared objects once
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class _Entry:
+    def __init__(self, payload, size):
+        self.payload = payload
+        self.size = size
+        self.leases = {}  # session_id -> last time the session used this result
+
+
+class ResultStore:
+    # Process-wide, content-addressed store for analysis payloads.
+    # Sessions keep only the key returned by put(). Each payload is held once,
+    # however many sessions look at it. Payloads are shared between sessions and
+    # must be treated as read-only.
+    # Streamlit does not tell us when a session goes away, so a session's lease
+    # lapses after `lease_ttl` seconds without a get(). An entry is evicted once
+    # no session holds a lease on it.
+
+    def __init__(self, lease_ttl=3600):
+        self.lease_ttl = lease_ttl
+        self._entries = {}
+        self._session_keys = {}  # session_id -> key currently held
+        self._lock = threading.Lock()
+
+    def put(self, payload, session_id):
+        key = payload_key(payload)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = _Entry(payload, deep_sizeof(payload))
+            self._lease(key, session_id)
+            self._sweep()
+        return key
+
+    def get(self, key, session_id):
+        with self._lock:
+            self._sweep()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._lease(key, session_id)
+            return entry.payload
+
+    def peek(self, key):
+        # Payload for key without taking a lease, or None if it has been evicted
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.payload if entry is not None else None
+
+    def release(self, session_id):
+        with self._lock:
+            self._drop_lease(session_id)
+
+    def stats(self):
+        with self._lock:
+            self._sweep()
+            stored_bytes = sum(entry.size for entry in self._entries.values())
+            # What the same sessions would cost if each kept its own copy
+            per_session_bytes = sum(entry.size * len(entry.leases) for entry in self._entries.values())
+            return {
+                "entries": len(self._entries),
+                "sessions": len(self._session_keys),
+                "stored_bytes": stored_bytes,
+                "per_session_copy_bytes": per_session_bytes,
+                "saved_bytes": per_session_bytes - stored_bytes,
+                "entry_bytes": {key[:12]: entry.size for key, entry in self._entries.items()},
+            }
+
+    def _lease(self, key, session_id):
+        if self._session_keys.get(session_id) != key:
+            self._drop_lease(session_id)
+            self._session_keys[session_id] = key
+        self._entries[key].leases[session_id] = time.monotonic()
+
+    def _drop_lease(self, session_id):
+        key = self._session_keys.pop(session_id, None)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.leases.pop(session_id, None)
+        if not entry.leases:
+            del self._entries[key]
+
+    def _sweep(self):
+        cutoff = time.monotonic() - self.lease_ttl
+        for key in list(self._entries):
+            entry = self._entries[key]
+            for session_id, last_used in list(entry.leases.items()):
+                if last_used < cutoff:
+                    del entry.leases[session_id]
+                    self._session_keys.pop(session_id, None)
+            if not entry.leases:
+                del self._entries[key]
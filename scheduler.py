@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class SchedulerOverloaded(Exception):
+    pass
+
+
+class _Ticket:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.granted = False
+
+
+class AnalysisScheduler:
+    # Process-wide admission control for backend analysis calls.
+    # At most `max_concurrent` calls run at once. Waiting calls are queued per
+    # session and served round-robin, so one busy session cannot starve the others.
+    # When the queue is full, new calls are rejected right away instead of waiting.
+
+    def __init__(self, max_concurrent=4, max_queued=16, per_session_limit=2, expected_duration=120.0):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.per_session_limit = per_session_limit
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session_id -> deque of waiting tickets
+        self._running = {}  # session_id -> number of running calls
+        self._active = 0
+        self._avg_duration = expected_duration
+
+    def run(self, session_id, fn, on_wait=None, poll_interval=1.0):
+        ticket = self._enqueue(session_id)
+        try:
+            with self._cond:
+                while not ticket.granted:
+                    if on_wait is not None:
+                        position = self._position(ticket)
+                        eta = self._eta(position)
+                        # Report outside the lock so a slow UI update can't stall other sessions
+                        self._cond.release()
+                        try:
+                            on_wait(position, eta)
+                        finally:
+                            self._cond.acquire()
+                        if ticket.granted:
+                            break
+                    self._cond.wait(poll_interval)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+        started = time.monotonic()
+        try:
+            return fn()
+        finally:
+            self._finish(ticket, time.monotonic() - started)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "running": self._active,
+                "queued": sum(len(q) for q in self._queues.values()),
+                "sessions_waiting": len(self._queues),
+                "avg_duration": self._avg_duration,
+            }
+
+    def _enqueue(self, session_id):
+        with self._cond:
+            queued = sum(len(q) for q in self._queues.values())
+            session_load = len(self._queues.get(session_id, ())) + self._running.get(session_id, 0)
+            if session_load >= self.per_session_limit:
+                raise SchedulerOverloaded(
+                    "You already have an analysis in progress. Please wait for it to finish."
+                )
+            if queued >= self.max_queued:
+                raise SchedulerOverloaded(
+                    "The analyzer is at capacity right now. Please try again in a few minutes."
+                )
+            ticket = _Ticket(session_id)
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            self._dispatch()
+            return ticket
+
+    def _dispatch(self):
+        # Hand free slots to the head of each session's queue in round-robin order
+        while self._active < self.max_concurrent and self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            ticket = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            ticket.granted = True
+            self._active += 1
+            self._running[session_id] = self._running.get(session_id, 0) + 1
+        self._cond.notify_all()
+
+    def _position(self, ticket):
+        # Number of waiting tickets that will be dispatched before this one
+        queues = list(self._queues.values())
+        position = 0
+        depth = 0
+        while True:
+            for queue in queues:
+                if depth < len(queue):
+                    if queue[depth] is ticket:
+                        return position
+                    position += 1
+            depth += 1
+
+    def _eta(self, position):
+        rounds = math.floor(position / self.max_concurrent) + 1
+        return rounds * self._avg_duration
+
+    def _abandon(self, ticket):
+        with self._cond:
+            if ticket.granted:
+                self._release(ticket.session_id)
+                return
+            queue = self._queues.get(ticket.session_id)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket.session_id]
+            self._cond.notify_all()
+
+    def _finish(self, ticket, duration):
+        with self._cond:
+            # Exponential moving average keeps the ETA responsive to backend slowdowns
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            self._release(ticket.session_id)
+
+    def _release(self, session_id):
+        self._active -= 1
+        self._running[session_id] -= 1
+        if self._running[session_id] == 0:
+            del self._running[session_id]
+        self._dispatch()
@@ -0,0 +1,147 @@
+# Local stand-in for the /analyze-shorts backend, plus a runnable check of AnalysisClient's
+# compressed transport and conditional revalidation against it.
+#
+#   python stand_in_server.py           # run the checks, exit non-zero on failure
+#   python stand_in_server.py --serve   # keep serving on 127.0.0.1:8765, then run the app with
+#                                       # YTA_API_URL=http://127.0.0.1:8765/analyze-shorts
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api_client import AnalysisClient, AnalysisError
+from result_store import ResultStore
+
+SAMPLE_STRATEGY = {
+    "target_audience": "Developers curious about AI tooling",
+    "overall_goal": "Grow a technical audience",
+    "marketing_tactics": {"recommended_tags_and_keywords": [["ai", 10], ["agents", 7], ["python", 4]]},
+    "trend_analysis": {"current_trends": "Agent frameworks", "future_predictions": "Multi-agent apps"},
+    "videos": {
+        "analyzed_videos": [{
+            "video_id": "abc123", "title": "AI Agents explained", "video_url": "https://youtu.be/abc123",
+            "description": "An overview", "tags": ["ai", "agents"],
+            "statistics": {"views": 10000, "likes": 500, "comments": 40, "subscribers": 2000,
+                           "engagement_rate": 5.4, "video_age_days": 10, "views_per_day": 0}
+        }],
+        "top_matches": {"trending": [], "search": []}
+    }
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Server attributes: body (bytes sent on 200), send_etag, on_request (optional callback)
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        json.loads(raw)
+        if self.server.on_request is not None:
+            self.server.on_request()
+
+        body = self.server.body
+        # Quoted SHA-256 of the decoded body: the same validator the client derives when no ETag is sent
+        validator = f'"{hashlib.sha256(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == validator:
+            # Counted before replying, so the client never sees the 304 ahead of the count
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.server.send_etag:
+            self.send_header("ETag", validator)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            payload = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port=0, body=None, send_etag=True):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.body = body if body is not None else json.dumps({"data": {"marketing_strategy": SAMPLE_STRATEGY}}).encode("utf-8")
+    server.send_etag = send_etag
+    server.on_request = None
+    server.not_modified = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def server_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/analyze-shorts"
+
+def run_checks():
+    failures = []
+
+    def check(name, condition):
+        print(f"{'ok' if condition else 'FAILED'}: {name}")
+        if not condition:
+            failures.append(name)
+
+    for send_etag in (True, False):
+        label = "ETag" if send_etag else "content-hash"
+        server = start_server(send_etag=send_etag)
+        client = AnalysisClient(url=server_url(server), compress_requests=True)
+        first = client.analyze("AI Agents", "both", "IN")
+        compressed = client.stats["bytes_received"]
+        second = client.analyze("AI Agents", "both", "IN")
+        check(f"{label}: gzip body decoded", first == SAMPLE_STRATEGY)
+        check(f"{label}: compressed size counted", compressed < len(server.body))
+        check(f"{label}: repeat request answered 304", server.not_modified == 1 and client.stats["revalidated"] == 1)
+        check(f"{label}: cached payload reused", second is first)
+
+        # Eviction while the conditional request is in flight must not break the 304 path
+        server.on_request = client._cache.clear
+        check(f"{label}: 304 after concurrent eviction", client.analyze("AI Agents", "both", "IN") is first)
+        server.shutdown()
+
+    # With a result store, the client cache holds no payloads and stops revalidating evicted ones
+    server = start_server()
+    store = ResultStore()
+    client = AnalysisClient(url=server_url(server), result_store=store)
+    store.put(client.analyze("AI Agents", "both", "IN"), "session")
+    repeated = client.analyze("AI Agents", "both", "IN")
+    check("store: 304 resolved from the result store", server.not_modified == 1 and repeated is store.peek(store.put(repeated, "session")))
+    check("store: client cache holds no payloads", all(isinstance(value, str) for _, value in client._cache.values()))
+    store.release("session")
+    client.analyze("AI Agents", "both", "IN")
+    check("store: evicted payload is downloaded again", server.not_modified == 1)
+    server.shutdown()
+
+    server = start_server(body=json.dumps({"status": "error"}).encode("utf-8"))
+    try:
+        AnalysisClient(url=server_url(server)).analyze("AI Agents", "both", "IN")
+        check("malformed 200 raises AnalysisError", False)
+    except AnalysisError as e:
+        check("malformed 200 raises AnalysisError", str(e) == "Malformed response")
+    server.shutdown()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in analysis backend")
+    parser.add_argument("--serve", action="store_true", help="Serve until interrupted instead of running checks")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    if args.serve:
+        server = start_server(port=args.port)
+        print(f"Serving on {server_url(server)}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        sys.exit(run_checks())
@@ -1,15 +1,23 @@
 import streamlit as st
-import requests
-import pandas as pd
-import json
-import plotly.express as px
-import plotly.graph_objects as go
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 import math
-import altair as alt
-from datetime import datetime, timedelta
-import random
+import os
+import uuid
+from scheduler import AnalysisScheduler, SchedulerOverloaded
+from api_client import API_URL, REGION_CODES, CONTENT_TYPES, AnalysisClient, AnalysisError
+from result_store import ResultStore
+from benchmarks import BenchmarkStore
+from metrics import (
+    DEFAULT_BENCHMARKS, compute_bubble_data, compute_payload_metrics, compute_engagement_comparison, compute_engagement_rates,
+    compute_radar_metrics, compute_views_per_day, project_view_growth
+)
+from report import REPORT_FORMATS, ReportError, check_report_format, export_report
+from cards import APP_CSS, format_number, get_video_thumbnail, render_video_card_html
+from charts import (
+    create_bubble_chart, create_cooccurrence_heatmap, create_engagement_chart, create_keyword_chart,
+    create_radar_chart, create_views_chart, create_wordcloud
+)
+from cooccurrence import compute_cooccurrence, top_cooccurrences
 
 # Set page config
 st.set_page_config(
@@ -19,175 +27,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Streamlit does not report column widths, so charts in the three metrics columns
+# are downsampled for a third of a wide layout on a large screen
+METRICS_COLUMN_WIDTH = 500
+
 # Custom CSS
-st.markdown("""
-<style>
-    /* Main styles */
-    .main {
-        background-color: #f9f9f9;
-    }
-    
-    /* Header styles */
-    .header-container {
-        background-color: #FF0000;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        color: white;
-        text-align: center;
-    }
-    
-    /* Card styles */
-    .video-card {
-        background-color: white;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin-bottom: 1rem;
-        padding: 1rem;
-        transition: transform 0.3s;
-    }
-    .video-card:hover {
-        transform: translateY(-5px);
-    }
-    
-    /* Metric styles */
-    .metric-container {
-        background-color: #f0f0f0;
-        border-radius: 8px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Button styles */
-    .stButton>button {
-        background-color: #FF0000;
-        color: white;
-        border-radius: 20px;
-        padding: 0.5rem 1.5rem;
-        border: none;
-        font-weight: bold;
-    }
-    
-    /* Tab styles */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        white-space: pre-wrap;
-        # background-color: #f0f0f0;
-        border-radius: 4px 4px 0px 0px;
-        gap: 1px;
-        padding: 15px;
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: #FF0000;
-        color: white;
-    }
-    
-    /* Section headers */
-    h1, h2, h3 {
-        color: #212121;
-    }
-    
-    /* Video statistics styles */
-    .stats-container {
-        display: flex;
-        justify-content: space-between;
-        flex-wrap: wrap;
-    }
-    .stat-item {
-        text-align: center;
-        padding: 0.5rem;
-        flex: 1;
-        min-width: 100px;
-    }
-    
-    /* Recommendation box */
-    .recommendation-box {
-        background-color: #f8f9fa;
-        border-left: 4px solid #FF0000;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Loading spinner */
-    .stSpinner > div > div {
-        border-top-color: #FF0000 !important;
-    }
-    
-    /* Make metric values stand out */
-    .big-metric {
-        font-size: 24px;
-        font-weight: bold;
-        color: #FF0000;
-    }
-    
-    /* Custom tag style */
-    .tag {
-        background-color: #e0e0e0;
-        padding: 5px 10px;
-        border-radius: 15px;
-        margin-right: 5px;
-        margin-bottom: 5px;
-        display: inline-block;
-        font-size: 0.8rem;
-    }
-    
-    /* Success metrics box */
-    .success-metric-box {
-        background-color: #f0f8ff;
-        border-radius: 8px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        border-left: 4px solid #4285f4;
-    }
-    
-    /* Custom expander styling */
-    .streamlit-expanderHeader {
-        font-weight: bold;
-        color: #212121;
-    }
-    
-    /* Thumbnail hover effect */
-    .thumbnail-container {
-        position: relative;
-        overflow: hidden;
-        border-radius: 8px;
-    }
-    .thumbnail-container img {
-        transition: transform 0.3s;
-    }
-    .thumbnail-container:hover img {
-        transform: scale(1.05);
-    }
-    
-    /* Video grid layout */
-    .video-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-        gap: 1rem;
-    }
-    
-    .recommendation-box, .success-metric-box {
-        height: 200px;
-        overflow-y: auto;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{APP_CSS}</style>", unsafe_allow_html=True)
 
 # Helper functions
-def get_video_thumbnail(video_id):
-    return f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
-
-def format_number(num):
-    if num >= 1000000:
-        return f"{num/1000000:.1f}M"
-    elif num >= 1000:
-        return f"{num/1000:.1f}K"
-    else:
-        return str(num)
-
 def get_engagement_color(rate):
     if rate > 0.1:  # 10% or higher
         return "#4CAF50"  # Green
@@ -198,68 +45,11 @@ def get_engagement_color(rate):
     else:
         return "#F44336"  # Red
 
-def create_wordcloud(keywords):
-    # Create word frequency dictionary
-    word_freq = {}
-    for item in keywords:
-        word_freq[item[0]] = item[1]
-    
-    # Generate WordCloud
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        colormap='viridis',
-        max_words=100,
-        contour_width=1,
-        contour_color='steelblue'
-    ).generate_from_frequencies(word_freq)
-    
-    return wordcloud
+def create_video_radar_chart(video_data, percentile_ranks=None):
+    return create_radar_chart(compute_radar_metrics(video_data['statistics'], percentile_ranks))
 
-def create_radar_chart(video_data):
-    # Normalize metrics for radar chart
-    
-    # st.write(video_data['statistics'])
-    metrics = {
-        'View/Sub Ratio': min(1.0, video_data['statistics']['views'] / (video_data['statistics']['subscribers'] or 100000)),
-        'Engagement Rate': video_data['statistics']['engagement_rate']/10,
-        'Like/View Ratio': video_data['statistics']['likes'] / video_data['statistics']['views']*10 if video_data['statistics']['views'] > 0 else 0,
-        'Comment/View Ratio': video_data['statistics']['comments'] / video_data['statistics']['views']*100 if video_data['statistics']['views'] > 0 else 0,
-        'Views/Day': min(1.0, video_data['statistics'].get('views_per_day', 0) / 500000)
-    }
-    
-    # st.write(metrics)
-    
-    categories = list(metrics.keys())
-    values = list(metrics.values())
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values,
-        theta=categories,
-        fill='toself',
-        name='Performance',
-        line_color='#FF0000',
-        fillcolor='rgba(255, 0, 0, 0.2)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 1]
-            )
-        ),
-        showlegend=False,
-        margin=dict(l=70, r=70, t=20, b=20),
-        height=300
-    )
-    
-    return fig
 
-def display_video_card(video, is_detailed=False):
+def display_video_card(video, is_detailed=False, percentile_ranks=None):
     col1, col2 = st.columns([1, 2])
     
     with col1:
@@ -272,7 +62,7 @@ def display_video_card(video, is_detailed=False):
         """, unsafe_allow_html=True)
         
         if is_detailed and 'statistics' in video:
-            radar_chart = create_radar_chart(video)
+            radar_chart = create_video_radar_chart(video, percentile_ranks)
             st.plotly_chart(radar_chart, use_container_width=True)
     
     with col2:
@@ -313,6 +103,61 @@ def display_video_card(video, is_detailed=False):
                     st.markdown("#### Future Predictions")
                     st.write(video['future_trends'])
 
+@st.cache_resource
+def get_analysis_scheduler():
+    # Shared by every session in this server process
+    return AnalysisScheduler(
+        max_concurrent=int(os.environ.get("YTA_MAX_CONCURRENT_ANALYSES", 4)),
+        max_queued=int(os.environ.get("YTA_MAX_QUEUED_ANALYSES", 16))
+    )
+
+@st.cache_resource
+def get_analysis_client():
+    # One client per process so connections and revalidation validators are reused across sessions
+    return AnalysisClient(
+        url=os.environ.get("YTA_API_URL", API_URL),
+        compress_requests=os.environ.get("YTA_COMPRESS_REQUESTS") == "1",
+        result_store=get_result_store()
+    )
+
+@st.cache_resource
+def get_result_store():
+    # Sessions keep only a key into this store; identical payloads are held once per process
+    return ResultStore(lease_ttl=int(os.environ.get("YTA_RESULT_TTL", 3600)))
+
+@st.cache_resource
+def get_benchmark_store():
+    # Sketches are persisted to disk and merged with other server processes on flush
+    return BenchmarkStore(os.environ.get("YTA_BENCHMARK_PATH", ".yta_benchmarks.json"))
+
+def get_percentile_ranks(video, region_code, content_type):
+    stats = video['statistics']
+    values = compute_engagement_rates(stats)
+    values['views_per_day'] = compute_views_per_day(stats)
+    store = get_benchmark_store()
+    return {
+        metric: store.percentile_rank(metric, value, region_code, content_type)
+        for metric, value in values.items()
+    }
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_report(analysis_key, _data, region_code, content_type, report_format):
+    # Cached per analysis and format; chart images are also reused from the report module's cache
+    metrics = compute_payload_metrics(_data, get_benchmark_store(), region_code, content_type)
+    title = f"YouTube Trends Analysis ({region_code}, {content_type})"
+    return export_report(title, _data, metrics, fmt=report_format)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_cooccurrence(analysis_key, _data):
+    # The sparse product is computed once per payload and shared, unpickled, across
+    # sessions and reruns; callers only slice it and must not modify it
+    return compute_cooccurrence(_data)
+
+def display_video_grid(videos):
+    # One delta message for the whole grid instead of a dozen elements per card
+    cards = "".join(render_video_card_html(video) for video in videos)
+    st.markdown(f'<div class="video-grid">{cards}</div>', unsafe_allow_html=True)
+
 # Main app
 def main():
     # Header
@@ -333,49 +178,106 @@ def main():
         
         content_type = st.selectbox(
             "Content Type",
-            ["shorts", "videos", "both"],
+            CONTENT_TYPES,
             index=2,
             help="Select the type of content you want to analyze"
         )
         
         region_code = st.selectbox(
             "Region",
-            ["US", "IN", "GB", "CA", "AU", "DE", "FR", "JP", "KR", "BR", "RU"],
+            REGION_CODES,
             index=1,
             help="Select the target region for your content"
         )
         
         submit_button = st.form_submit_button("Analyze Content")
     
+    compact_cards = st.sidebar.checkbox(
+        "Compact video cards",
+        value=True,
+        help="Render video cards as a single HTML grid. Faster on large result sets."
+    )
+    
     # Display sample data or processed results
-    if 'analysis_data' not in st.session_state:
-        st.session_state.analysis_data = None
+    if 'analysis_key' not in st.session_state:
+        st.session_state.analysis_key = None
+    
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
     
     if submit_button:
+        queue_status = st.empty()
+        
+        def show_queue_position(position, eta):
+            queue_status.info(
+                f"⏳ Waiting for a free analysis slot: you are #{position + 1} in line, "
+                f"estimated start in about {math.ceil(eta / 60)} min."
+            )
+        
         with st.spinner("Analyzing YouTube trends... This may take a few minutes..."):
             try:
                 # Make API call to the Flask backend
-                response = requests.post(
-                    "https://youtube-trend-api.onrender.com/analyze-shorts",
-                    json={
-                        "prompt": prompt,
-                        "content_type": content_type,
-                        "region_code": region_code
-                    },
-                    timeout=300  # Increased timeout for longer API calls
+                client = get_analysis_client()
+                analysis_data = get_analysis_scheduler().run(
+                    st.session_state.session_id,
+                    lambda: client.analyze(prompt, content_type, region_code),
+                    on_wait=show_queue_position
                 )
+                queue_status.empty()
                 
-                if response.status_code == 200:
-                    st.session_state.analysis_data = response.json()['data']['marketing_strategy']
-                    st.success("Analysis complete! Scroll down to see results.")
-                else:
-                    st.error(f"Error: {response.json().get('message', 'Unknown error')}")
+                st.session_state.analysis_key = get_result_store().put(analysis_data, st.session_state.session_id)
+                st.session_state.analysis_params = (region_code, content_type)
+                try:
+                    get_benchmark_store().observe(analysis_data, region_code, content_type)
+                except OSError as e:
+                    st.warning(f"Could not update engagement benchmarks: {str(e)}")
+                st.success("Analysis complete! Scroll down to see results.")
+            except SchedulerOverloaded as e:
+                queue_status.empty()
+                st.warning(str(e))
+            except AnalysisError as e:
+                st.error(f"Error: {str(e)}")
             except Exception as e:
                 st.error(f"Error connecting to API: {str(e)}")
     
+    data = None
+    if st.session_state.analysis_key:
+        data = get_result_store().get(st.session_state.analysis_key, st.session_state.session_id)
+        if data is None:
+            st.session_state.analysis_key = None
+            st.info("Your previous analysis has expired. Please run it again.")
+    
+    if st.query_params.get("debug") == "1" or os.environ.get("YTA_DEBUG") == "1":
+        with st.sidebar.expander("Debug"):
+            st.markdown("**Result store**")
+            st.json(get_result_store().stats())
+            st.markdown("**Scheduler**")
+            st.json(get_analysis_scheduler().stats())
+            st.markdown("**API client**")
+            st.json(get_analysis_client().stats)
+    
     # Display results if available
-    if st.session_state.analysis_data:
-        data = st.session_state.analysis_data
+    if data:
+        analysis_region, analysis_content_type = st.session_state.get('analysis_params', (region_code, content_type))
+        benchmarks = get_benchmark_store()
+        
+        with st.sidebar:
+            st.markdown("### 📄 Export Report")
+            report_format = st.selectbox("Report format", REPORT_FORMATS, format_func=str.upper)
+            try:
+                check_report_format(report_format)
+            except ReportError as e:
+                st.error(str(e))
+            else:
+                analysis_key = st.session_state.analysis_key
+                # Rendered only when clicked, on a separate thread, so one click renders and
+                # downloads; errors there cannot reach the page, hence the format check above
+                st.download_button(
+                    "Export report",
+                    lambda: build_report(analysis_key, data, analysis_region, analysis_content_type, report_format),
+                    file_name=f"youtube-trends-{analysis_region}-{analysis_content_type}.{report_format}",
+                    mime="application/pdf" if report_format == "pdf" else "text/html"
+                )
         
         # Main tabs
         tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🎥 Analyzed Videos", "📈 Content Strategy", "🔍 All Videos"])
@@ -420,19 +322,17 @@ def main():
                 
                 with keyword_cols[1]:
                     # Create a bar chart for top keywords
-                    sorted_keywords = sorted(keywords, key=lambda x: x[1], reverse=True)[:10]
-                    keyword_df = pd.DataFrame(sorted_keywords, columns=['Keyword', 'Count'])
-                    
-                    chart = alt.Chart(keyword_df).mark_bar().encode(
-                        y=alt.Y('Keyword:N', sort='-x', title=None),
-                        x=alt.X('Count:Q', title='Frequency'),
-                        color=alt.Color('Count:Q', scale=alt.Scale(scheme='reds'), legend=None),
-                        tooltip=['Keyword', 'Count']
-                    ).properties(
-                        height=300
-                    )
-                    
-                    st.altair_chart(chart, use_container_width=True)
+                    st.altair_chart(create_keyword_chart(keywords), use_container_width=True)
+            
+            # Keywords that appear together across analyzed and matching videos
+            counts, terms, doc_freq = get_cooccurrence(st.session_state.analysis_key, data)
+            if counts.nnz > 0:
+                st.markdown("### 🔗 Keyword Co-occurrence")
+                max_nodes = len(terms)
+                if len(terms) > 5:
+                    max_nodes = st.slider("Keywords shown", 5, min(50, len(terms)), min(20, len(terms)))
+                top_terms, cooccurrence_rows = top_cooccurrences(counts, terms, doc_freq, max_nodes=max_nodes)
+                st.altair_chart(create_cooccurrence_heatmap(top_terms, cooccurrence_rows), use_container_width=True)
             
             # Current trends and future predictions
             st.markdown("### 🔮 Trend Analysis")
@@ -460,10 +360,17 @@ def main():
             
             if 'analyzed_videos' in data.get('videos', {}):
                 for i, video in enumerate(data['videos']['analyzed_videos']):
-                    st.markdown(f"""<div class="video-card">""", unsafe_allow_html=True)
-                    st.subheader(f"Video {i+1}: {'Trending' if i==0 else 'Search'} Analysis")
-                    display_video_card(video, is_detailed=True)
-                    st.markdown("""</div>""", unsafe_allow_html=True)
+                    heading = f"Video {i+1}: {'Trending' if i==0 else 'Search'} Analysis"
+                    percentile_ranks = None
+                    if 'statistics' in video:
+                        percentile_ranks = get_percentile_ranks(video, analysis_region, analysis_content_type)
+                    if compact_cards:
+                        st.markdown(render_video_card_html(video, heading=heading, is_detailed=True), unsafe_allow_html=True)
+                        if 'statistics' in video:
+                            st.plotly_chart(create_video_radar_chart(video, percentile_ranks), use_container_width=True)
+                    else:
+                        st.subheader(heading)
+                        display_video_card(video, is_detailed=True, percentile_ranks=percentile_ranks)
                     
                     # Specific video metrics
                     if 'statistics' in video:
@@ -471,173 +378,23 @@ def main():
                         metrics_cols = st.columns(3)
                         
                         with metrics_cols[0]:
-                            # Views over time chart - Fix potential missing or zero views_per_day
-                            # Calculate views_per_day if not present
-                            if 'views_per_day' not in video['statistics'] or video['statistics']['views_per_day'] == 0:
-                                # Estimate views per day based on total views divided by estimated age of video (default 30 days if not available)
-                                video_age_days = video['statistics']['video_age_days']
-                                if video_age_days == 0:  # Avoid division by zero
-                                    video_age_days = 1
-                                views_per_day = video['statistics']['views'] / video_age_days
-                            else:
-                                views_per_day = video['statistics']['views_per_day']
-                            
-                            # Ensure we have a reasonable value for visualization
-                            views_per_day = max(1, views_per_day)  # Minimum 1 view per day
-                            days = 30
-                            cumulative_views = []
-                            daily_views = []
-                            
-                            # Generate a more realistic view growth pattern
-                            view_multipliers = [random.uniform(0.1, 10) for _ in range(5)] + \
-                                            [random.uniform(0.1, 1.2) for _ in range(15)] + \
-                                            [random.uniform(0.1, 1.0) for _ in range(10)]
-                            
-                            random.shuffle(view_multipliers)
-                            
-                            for d in range(days):
-                                # Add randomness to daily views with more variance at the beginning
-                                daily_view = max(1, views_per_day * view_multipliers[d])
-                                daily_views.append(daily_view)
-                                cumulative_views.append(sum(daily_views))
-                            
-                            views_df = pd.DataFrame({
-                                'Day': list(range(1, days+1)),
-                                'Views': cumulative_views
-                            })
-                            
-                            views_chart = alt.Chart(views_df).mark_area(
-                                color='#FF0000',
-                                opacity=0.3,
-                                line={
-                                    'color': '#FF0000', 
-                                    'size': 2
-                                }
-                            ).encode(
-                                x=alt.X('Day:Q', title='Days Since Publishing'),
-                                y=alt.Y('Views:Q', title='Cumulative Views'),
-                                tooltip=['Day', alt.Tooltip('Views:Q', format=',')]
-                            ).properties(
-                                title='Projected View Growth',
-                                height=250
-                            )
-                            
+                            # Views over time chart
+                            views_chart = create_views_chart(project_view_growth(video['statistics']), width=METRICS_COLUMN_WIDTH)
                             st.altair_chart(views_chart, use_container_width=True)
                         
                         with metrics_cols[1]:
-                            # Engagement metrics comparison - Fix for potential zero values
-                            views = max(1, video['statistics']['views'])  # Avoid division by zero
-                            likes = video['statistics']['likes']
-                            comments = video['statistics']['comments']
-                            
-                            # st.write(views,likes,comments)
-                            
-                            # Calculate engagement metrics
-                            like_view_ratio = likes / views
-                            comment_view_ratio = comments / views
-                            
-                            # Get overall engagement or calculate if missing
-                            engagement_rate = video['statistics']['engagement_rate']
-                            if engagement_rate == 0:
-                                # Simplified engagement rate calculation if not provided
-                                engagement_rate = (like_view_ratio + comment_view_ratio) / 2
-                            
-                            # Industry benchmarks
-                            like_benchmark = 0.05  # 5% likes per view
-                            comment_benchmark = 0.01  # 1% comments per view
-                            engagement_benchmark = 0.06  # 6% overall engagement
-                            
-                            # st.write(like_view_ratio,comment_view_ratio,engagement_rate)
-                            
-                            # Create dataframe for visualization
-                            engagement_data = pd.DataFrame({
-                                'Metric': ['Like/View', 'Comment/View', 'Overall Engagement'],
-                                'Value': [like_view_ratio, comment_view_ratio, engagement_rate/100],
-                                'Benchmark': [like_benchmark, comment_benchmark, engagement_benchmark]
-                            })
-                            
-                            engagement_df = pd.melt(
-                                engagement_data,
-                                id_vars=['Metric'],
-                                value_vars=['Value', 'Benchmark'],
-                                var_name='Type',
-                                value_name='Rate'
-                            )
-                            
-                            engagement_chart = alt.Chart(engagement_df).mark_bar().encode(
-                                x=alt.X('Metric:N', title=None),
-                                y=alt.Y('Rate:Q', title='Rate', axis=alt.Axis(format='.1%')),
-                                color=alt.Color('Type:N', scale=alt.Scale(
-                                    domain=['Value', 'Benchmark'],
-                                    range=['#FF0000', '#757575']
-                                )),
-                                tooltip=['Metric', 'Type', alt.Tooltip('Rate:Q', format='.2%')]
-                            ).properties(
-                                title='Engagement vs Benchmark',
-                                height=250
-                            )
-                            
-                            st.altair_chart(engagement_chart, use_container_width=True)
+                            # Engagement metrics comparison against learned percentiles
+                            percentiles = {
+                                metric: benchmarks.percentiles(metric, analysis_region, analysis_content_type)
+                                for metric in DEFAULT_BENCHMARKS
+                            }
+                            engagement_rows = compute_engagement_comparison(video['statistics'], percentiles)
+                            st.altair_chart(create_engagement_chart(engagement_rows), use_container_width=True)
                         
                         with metrics_cols[2]:
                             # Create a bubble chart showing relationship between engagement metrics
-                            # Extract data from existing metrics
-                            views = max(1, video['statistics']['views'])
-                            likes = video['statistics']['likes']
-                            comments = video['statistics']['comments']
-                            engagement_rate = video['statistics'].get('engagement_rate', 0)
-                            if engagement_rate == 0:
-                                engagement_rate = ((likes / views) + (comments / views)) / 2 * 100
-                            
-                            # Create data for bubble chart
-                            # Show relationship between: Views, Likes, Comments, and Engagement Rate
-                            bubble_data = [
-                                {"metric": "Likes-Comments Ratio", "x": likes / max(1, comments), "y": likes / max(1, views) * 100, 
-                                "size": (likes / max(1, views) * 100)**2, "color": "Likes"},
-                                {"metric": "Comments-Views Ratio", "x": comments / max(1, views) * 1000, "y": comments / max(1, likes) * 100, 
-                                "size": (comments / max(1, views) * 100)*100, "color": "Comments"},
-                                {"metric": "Overall Engagement", "x": engagement_rate / 10, "y": (likes + comments) / max(1, views) * 100, 
-                                "size": engagement_rate**2, "color": "Engagement"}
-                            ]
-                            
-                            # st.write(bubble_data)
-                            
-                            bubble_df = pd.DataFrame(bubble_data)
-                            
-                            # Create bubble chart
-                            bubble_chart = alt.Chart(bubble_df).mark_circle().encode(
-                                x=alt.X('x:Q', title='Interaction Rate (scaled)'),
-                                y=alt.Y('y:Q', title='Percentage of Views', axis=alt.Axis(format='.1f')),
-                                size=alt.Size('size:Q', legend=None),
-                                color=alt.Color('color:N', scale=alt.Scale(
-                                    domain=['Likes', 'Comments', 'Engagement'],
-                                    range=['#FF0000', '#4285F4', '#FBBC05']
-                                )),
-                                tooltip=['metric', 
-                                        alt.Tooltip('x:Q', title='Interaction Rate', format='.2f'),
-                                        alt.Tooltip('y:Q', title='% of Views', format='.2f')]
-                            ).properties(
-                                title='Engagement Bubble Analysis',
-                                height=250
-                            )
-                            
-                            # Add text labels to each bubble
-                            text = alt.Chart(bubble_df).mark_text(
-                                align='center',
-                                baseline='middle',
-                                fontSize=11,
-                                fontWeight='bold',
-                                color='white'
-                            ).encode(
-                                x='x:Q',
-                                y='y:Q',
-                                text='metric:N'
-                            )
-                            
-                            # Combine chart and labels
-                            final_chart = (bubble_chart + text)
-                            
-                            st.altair_chart(final_chart, use_container_width=True)
+                            bubble_chart = create_bubble_chart(compute_bubble_data(video['statistics']))
+                            st.altair_chart(bubble_chart, use_container_width=True)
                         
             else:
                 st.info("No analyzed videos available")
@@ -783,20 +540,22 @@ def main():
                     st.markdown("#### Trending Matches")
                     trending_matches = data['videos']['top_matches']['trending']
                     
-                    for video in trending_matches:
-                        st.markdown(f"""<div class="video-card">""", unsafe_allow_html=True)
-                        display_video_card(video)
-                        st.markdown("""</div>""", unsafe_allow_html=True)
+                    if compact_cards:
+                        display_video_grid(trending_matches)
+                    else:
+                        for video in trending_matches:
+                            display_video_card(video)
                 
                 # Top search matches
                 if 'top_matches' in data.get('videos', {}) and 'search' in data['videos']['top_matches']:
                     st.markdown("#### Search Matches")
                     search_matches = data['videos']['top_matches']['search']
                     
-                    for video in search_matches:
-                        st.markdown(f"""<div class="video-card">""", unsafe_allow_html=True)
-                        display_video_card(video)
-                        st.markdown("""</div>""", unsafe_allow_html=True)
+                    if compact_cards:
+                        display_video_grid(search_matches)
+                    else:
+                        for video in search_matches:
+                            display_video_card(video)
             
             # with video_tabs[1]:
             #     st.markdown("### 👯 Similar Content")